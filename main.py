@@ -1,21 +1,33 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, StreamingResponse, FileResponse, ORJSONResponse, Response
 from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel, Field
-from typing import Optional
-import io
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy.orm import Session
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import List, Optional
+import asyncio
 import base64
+import os
 
 from video_engine.pipeline import generate_video_sync, generate_video_from_dsl, PipelineError
 from video_engine.llm_translator import get_available_models
-from video_engine.database import get_all_videos, get_video_by_id, delete_video
+from video_engine.database import init_db, get_db, get_all_videos_metadata_only, get_video_by_id, get_video_bytes, compute_etag, delete_video
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_db()
+    yield
+
 
 app = FastAPI(
     title="AnveshAI Video Generator",
     description="Programmatic video generation using LLM-to-DSL translation",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -24,6 +36,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DSL"],
 )
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -31,6 +44,8 @@ templates = Jinja2Templates(directory="templates")
 
 
 class GenerateRequest(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True)
+    
     prompt: str = Field(..., description="Natural language description of the animation")
     duration: float = Field(default=3.0, ge=0.5, le=6.0, description="Duration in seconds (max 6)")
     fps: int = Field(default=24, ge=1, le=24, description="Frames per second (max 24)")
@@ -40,16 +55,77 @@ class GenerateRequest(BaseModel):
 
 
 class DSLRequest(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True)
+    
     dsl: str = Field(..., description="DSL animation script")
     width: int = Field(default=640, ge=320, le=1280, description="Video width (max 1280)")
     height: int = Field(default=360, ge=180, le=720, description="Video height (max 720)")
 
 
-class GenerateResponse(BaseModel):
-    ok: bool
-    video_base64: Optional[str] = None
-    dsl: Optional[str] = None
-    error: Optional[str] = None
+class VideoSummary(BaseModel):
+    id: int
+    prompt: Optional[str] = None
+    model_used: Optional[str] = None
+    duration: Optional[float] = None
+    fps: Optional[int] = None
+    created_at: datetime
+    download_url: str
+
+
+# Every server worker enforces its own limit, so the default splits half the
+# cores between the WEB_CONCURRENCY workers (python main.py sets it for them).
+WEB_CONCURRENCY = max(1, int(os.environ.get("WEB_CONCURRENCY", 1)))
+RENDER_CONCURRENCY = int(os.environ.get(
+    "RENDER_CONCURRENCY", max(1, (os.cpu_count() or 1) // 2 // WEB_CONCURRENCY)
+))
+MAX_QUEUED_RENDERS = RENDER_CONCURRENCY * 4
+
+_render_semaphore = asyncio.Semaphore(RENDER_CONCURRENCY)
+_queued_renders = 0
+
+
+@asynccontextmanager
+async def render_slot():
+    """Limit concurrent renders per worker and reject requests once the wait queue is full."""
+    global _queued_renders
+    if _render_semaphore.locked() and _queued_renders >= MAX_QUEUED_RENDERS:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many videos are being generated, please try again shortly",
+            headers={"Retry-After": "5"}
+        )
+    
+    _queued_renders += 1
+    try:
+        await _render_semaphore.acquire()
+    finally:
+        _queued_renders -= 1
+    
+    try:
+        yield
+    finally:
+        _render_semaphore.release()
+
+
+STREAM_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_CHUNK_SIZE = 100 * 1024
+VIDEO_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Bare download URLs can point at a different video after a delete, since
+# SQLite reuses the highest id; those are always revalidated by ETag.
+UNVERSIONED_CACHE_CONTROL = "no-cache"
+
+
+async def iter_chunks(data: bytes, chunk_size: int = STREAM_CHUNK_SIZE):
+    view = memoryview(data)
+    for i in range(0, len(view), chunk_size):
+        yield view[i:i + chunk_size]
+
+
+def mp4_response(video_bytes: bytes, dsl: Optional[str] = None) -> StreamingResponse:
+    headers = {"Content-Length": str(len(video_bytes))}
+    if dsl is not None:
+        headers["X-DSL"] = base64.urlsafe_b64encode(dsl.encode('utf-8')).decode('ascii')
+    return StreamingResponse(iter_chunks(video_bytes), media_type="video/mp4", headers=headers)
 
 
 @app.get('/', response_class=HTMLResponse)
@@ -72,37 +148,41 @@ def get_models():
     return get_available_models()
 
 
-@app.post('/generate', response_model=GenerateResponse)
-def generate(req: GenerateRequest):
-    try:
-        video_b64, dsl = generate_video_sync(
-            prompt=req.prompt,
-            duration=req.duration,
-            fps=req.fps,
-            width=req.width,
-            height=req.height,
-            model=req.model
-        )
-        return GenerateResponse(ok=True, video_base64=video_b64, dsl=dsl)
-    except PipelineError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
-
-
-@app.post('/generate-dsl', response_model=GenerateResponse)
-def generate_from_dsl(req: DSLRequest):
-    try:
-        video_b64 = generate_video_from_dsl(
-            dsl_script=req.dsl,
-            width=req.width,
-            height=req.height
-        )
-        return GenerateResponse(ok=True, video_base64=video_b64)
-    except PipelineError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+@app.post('/generate', response_class=StreamingResponse)
+async def generate(req: GenerateRequest):
+    async with render_slot():
+        try:
+            video_bytes, dsl = await asyncio.to_thread(
+                generate_video_sync,
+                prompt=req.prompt,
+                duration=req.duration,
+                fps=req.fps,
+                width=req.width,
+                height=req.height,
+                model=req.model
+            )
+            return mp4_response(video_bytes, dsl)
+        except PipelineError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+
+
+@app.post('/generate-dsl', response_class=StreamingResponse)
+async def generate_from_dsl(req: DSLRequest):
+    async with render_slot():
+        try:
+            video_bytes = await asyncio.to_thread(
+                generate_video_from_dsl,
+                dsl_script=req.dsl,
+                width=req.width,
+                height=req.height
+            )
+            return mp4_response(video_bytes)
+        except PipelineError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
 
 
 @app.get('/health')
@@ -139,9 +219,9 @@ TEXT "Hello" AT 280,50 SIZE 36 COLOR #FFFFFF"""
     }
 
 
-@app.get('/api/videos')
-def list_videos():
-    videos = get_all_videos()
+@app.get('/api/videos', response_model=List[VideoSummary], response_model_exclude_none=True)
+async def list_videos(db: Session = Depends(get_db)):
+    videos = await asyncio.to_thread(get_all_videos_metadata_only, db)
     return [
         {
             "id": v.id,
@@ -149,34 +229,74 @@ def list_videos():
             "model_used": v.model_used,
             "duration": v.duration,
             "fps": v.fps,
-            "created_at": v.created_at.isoformat(),
-            "video_base64": base64.b64encode(v.video_base64).decode('utf-8') if isinstance(v.video_base64, bytes) else v.video_base64
+            "created_at": v.created_at,
+            # Versioned by content so an immutable cache entry never outlives a reused id
+            "download_url": f"/api/videos/{v.id}/download" + (f"?v={v.etag}" if v.etag else "")
         }
         for v in videos
     ]
 
 
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return '*' in candidates or etag in candidates
+
+
 @app.get('/api/videos/{video_id}/download')
-def download_video(video_id: int):
-    video = get_video_by_id(video_id)
+async def download_video(video_id: int, request: Request, db: Session = Depends(get_db)):
+    video = await asyncio.to_thread(get_video_by_id, db, video_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
     
-    video_bytes = video.video_base64 if isinstance(video.video_base64, bytes) else video.video_base64.encode('utf-8')
+    # A URL versioned with the video's ETag always names the same bytes, so
+    # browsers may cache it indefinitely.
+    versioned = video.etag is not None and request.query_params.get("v") == video.etag
+    cache_headers = {"Cache-Control": VIDEO_CACHE_CONTROL if versioned else UNVERSIONED_CACHE_CONTROL}
+    if video.etag:
+        cache_headers["ETag"] = f'"{video.etag}"'
+        if etag_matches(request.headers.get("if-none-match"), cache_headers["ETag"]):
+            return Response(status_code=304, headers=cache_headers)
+    
+    if video.video_path and os.path.exists(video.video_path):
+        return FileResponse(
+            video.video_path,
+            media_type="video/mp4",
+            filename=f"video_{video_id}.mp4",
+            headers=cache_headers
+        )
+    
+    # Rows saved before videos were written to disk keep the MP4 in the database.
+    video_bytes = await asyncio.to_thread(get_video_bytes, db, video_id)
+    if video_bytes is None:
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    if not video.etag:
+        cache_headers["ETag"] = f'"{compute_etag(video_bytes)}"'
+        if etag_matches(request.headers.get("if-none-match"), cache_headers["ETag"]):
+            return Response(status_code=304, headers=cache_headers)
+    
     return StreamingResponse(
-        io.BytesIO(video_bytes),
+        iter_chunks(video_bytes, DOWNLOAD_CHUNK_SIZE),
         media_type="video/mp4",
-        headers={"Content-Disposition": f"attachment; filename=video_{video_id}.mp4"}
+        headers={
+            "Content-Disposition": f"attachment; filename=video_{video_id}.mp4",
+            "Content-Length": str(len(video_bytes)),
+            **cache_headers
+        }
     )
 
 
 @app.delete('/api/videos/{video_id}')
-def delete_video_endpoint(video_id: int):
-    if delete_video(video_id):
+def delete_video_endpoint(video_id: int, db: Session = Depends(get_db)):
+    if delete_video(db, video_id):
         return {"ok": True}
     raise HTTPException(status_code=404, detail="Video not found")
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=5000)
+    # Exported so the spawned workers size RENDER_CONCURRENCY for their share
+    workers = int(os.environ.setdefault("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+    uvicorn.run("main:app", host="0.0.0.0", port=5000, workers=workers)
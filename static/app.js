@@ -60,20 +60,15 @@ document.addEventListener('DOMContentLoaded', function() {
                 })
             });
             
-            const data = await response.json();
-            
             if (!response.ok) {
-                throw new Error(data.detail || 'Generation failed');
+                throw new Error(await readError(response));
             }
             
-            if (data.ok && data.video_base64) {
-                displayVideo(data.video_base64);
-                if (data.dsl) {
-                    dslPreview.textContent = data.dsl;
-                    dslPreview.style.display = 'block';
-                }
-            } else {
-                throw new Error(data.error || 'Unknown error');
+            displayVideo(await response.blob());
+            const dsl = decodeDslHeader(response.headers.get('X-DSL'));
+            if (dsl) {
+                dslPreview.textContent = dsl;
+                dslPreview.style.display = 'block';
             }
         } catch (err) {
             showError(err.message);
@@ -103,17 +98,11 @@ document.addEventListener('DOMContentLoaded', function() {
                 })
             });
             
-            const data = await response.json();
-            
             if (!response.ok) {
-                throw new Error(data.detail || 'Generation failed');
+                throw new Error(await readError(response));
             }
             
-            if (data.ok && data.video_base64) {
-                displayVideo(data.video_base64);
-            } else {
-                throw new Error(data.error || 'Unknown error');
-            }
+            displayVideo(await response.blob());
         } catch (err) {
             showError(err.message);
         } finally {
@@ -121,15 +110,39 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
     
-    function displayVideo(base64) {
+    let currentVideoUrl = null;
+    
+    function displayVideo(blob) {
+        if (currentVideoUrl) {
+            URL.revokeObjectURL(currentVideoUrl);
+        }
+        currentVideoUrl = URL.createObjectURL(blob);
         videoContainer.innerHTML = `
             <video controls autoplay loop>
-                <source src="data:video/mp4;base64,${base64}" type="video/mp4">
+                <source src="${currentVideoUrl}" type="video/mp4">
                 Your browser does not support video playback.
             </video>
         `;
     }
     
+    async function readError(response) {
+        try {
+            const data = await response.json();
+            return data.detail || 'Generation failed';
+        } catch (err) {
+            return 'Generation failed';
+        }
+    }
+    
+    function decodeDslHeader(value) {
+        if (!value) {
+            return '';
+        }
+        const binary = atob(value.replace(/-/g, '+').replace(/_/g, '/'));
+        const bytes = Uint8Array.from(binary, c => c.charCodeAt(0));
+        return new TextDecoder().decode(bytes);
+    }
+    
     function showLoading() {
         loading.classList.add('active');
         generateBtn.disabled = true;
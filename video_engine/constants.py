@@ -8,15 +8,15 @@ RENDER_TIMEOUT = 30
 
 VALID_COLORS_PATTERN = r'^#[0-9A-Fa-f]{6}$'
 
-ALLOWED_COMMANDS = {
+ALLOWED_COMMANDS = frozenset({
     'BACKGROUND',
     'TEXT',
     'SHAPE',
     'MOVE',
     'FPS',
     'DURATION',
-}
+})
 
-ALLOWED_SHAPE_TYPES = {'CIRCLE', 'RECT'}
+ALLOWED_SHAPE_TYPES = frozenset({'CIRCLE', 'RECT'})
 
-ALLOWED_EASE_TYPES = {'linear', 'ease-in', 'ease-out'}
+ALLOWED_EASE_TYPES = frozenset({'linear', 'ease-in', 'ease-out'})
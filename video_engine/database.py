@@ -1,12 +1,41 @@
+import hashlib
+import os
+import threading
+import uuid
 from datetime import datetime
-from typing import Optional
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, LargeBinary
+from typing import Any, Dict, List, Optional
+from sqlalchemy import create_engine, event, inspect, text, Column, Integer, String, Float, DateTime, LargeBinary
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session, defer
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, single-worker setups only
+    fcntl = None
 
 DATABASE_URL = "sqlite:///./videos.db"
+VIDEO_DIR = "videos"
+# Held while creating or migrating the schema, so server workers starting
+# together do not race each other's ALTER TABLE statements
+INIT_LOCK_PATH = "./videos.db.lock"
+
+engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=20,
+    max_overflow=10
+)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, _):
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -23,11 +52,91 @@ class VideoMetadata(Base):
     fps = Column(Integer)
     width = Column(Integer)
     height = Column(Integer)
-    video_base64 = Column(LargeBinary)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Only set on rows saved before MP4s were written to VIDEO_DIR
+    video_bytes = Column(LargeBinary, nullable=True)
+    video_path = Column(String, nullable=True)
+    etag = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+# Columns added after the first release, created on existing databases by init_db
+_ADDED_COLUMNS = {
+    "video_path": "VARCHAR",
+    "etag": "VARCHAR",
+}
+
+
+def compute_etag(video_bytes: bytes) -> str:
+    return hashlib.blake2b(video_bytes, digest_size=16).hexdigest()
+
+
+def _alter(sql: str):
+    # Another process may have applied the same change between our schema
+    # check and this statement; that is not an error
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(sql))
+    except OperationalError as e:
+        message = str(e.orig)
+        if "duplicate column" not in message and "no such column" not in message:
+            raise
+
+
+def init_db():
+    global _db_ready
+    os.makedirs(VIDEO_DIR, exist_ok=True)
+    
+    with open(INIT_LOCK_PATH, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            Base.metadata.create_all(bind=engine)
+            
+            columns = {c["name"] for c in inspect(engine).get_columns(VideoMetadata.__tablename__)}
+            if "video_base64" in columns and "video_bytes" not in columns:
+                _alter("ALTER TABLE videos RENAME COLUMN video_base64 TO video_bytes")
+            for name, sql_type in _ADDED_COLUMNS.items():
+                if name not in columns:
+                    _alter(f"ALTER TABLE videos ADD COLUMN {name} {sql_type}")
+            with engine.begin() as conn:
+                # create_all skips indexes on tables that already exist
+                for index in VideoMetadata.__table__.indexes:
+                    index.create(conn, checkfirst=True)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    _db_ready = True
+
+
+_db_ready = False
+_db_ready_lock = threading.Lock()
+
+
+def ensure_db():
+    """Run init_db once per process, for callers that do not go through the app"""
+    if _db_ready:
+        return
+    with _db_ready_lock:
+        if not _db_ready:
+            init_db()
+
 
+def write_video_file(video_bytes: bytes) -> str:
+    os.makedirs(VIDEO_DIR, exist_ok=True)
+    path = os.path.join(VIDEO_DIR, f"{uuid.uuid4().hex}.mp4")
+    with open(path, 'wb') as f:
+        f.write(video_bytes)
+    return path
 
-Base.metadata.create_all(bind=engine)
+
+def remove_video_file(path: Optional[str]):
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
 
 
 def get_db():
@@ -39,8 +148,9 @@ def get_db():
 
 
 def save_video_metadata(
+    db: Session,
     dsl_script: str,
-    video_base64: bytes,
+    video_bytes: bytes,
     prompt: Optional[str] = None,
     model: str = "auto",
     duration: float = 3.0,
@@ -48,51 +158,94 @@ def save_video_metadata(
     width: int = 640,
     height: int = 360
 ) -> "VideoMetadata":
-    db = SessionLocal()
+    video_path = write_video_file(video_bytes)
+    video = VideoMetadata(
+        prompt=prompt,
+        dsl_script=dsl_script,
+        model_used=model,
+        duration=duration,
+        fps=fps,
+        width=width,
+        height=height,
+        video_path=video_path,
+        etag=compute_etag(video_bytes)
+    )
     try:
-        video_bytes = video_base64 if isinstance(video_base64, bytes) else video_base64
-        video = VideoMetadata(
-            prompt=prompt,
-            dsl_script=dsl_script,
-            model_used=model,
-            duration=duration,
-            fps=fps,
-            width=width,
-            height=height,
-            video_base64=video_bytes
-        )
         db.add(video)
         db.commit()
-        db.refresh(video)
-        return video
-    finally:
-        db.close()
+    except Exception:
+        db.rollback()
+        remove_video_file(video_path)
+        raise
+    db.refresh(video)
+    return video
 
 
-def get_all_videos():
-    db = SessionLocal()
-    try:
-        return db.query(VideoMetadata).order_by(VideoMetadata.created_at.desc()).all()
-    finally:
-        db.close()
+def save_videos_bulk(rows: List[Dict[str, Any]]) -> int:
+    """Insert many videos in one transaction.
 
-
-def get_video_by_id(video_id: int):
-    db = SessionLocal()
-    try:
-        return db.query(VideoMetadata).filter(VideoMetadata.id == video_id).first()
-    finally:
-        db.close()
-
-
-def delete_video(video_id: int):
-    db = SessionLocal()
+    Each row takes the keyword arguments of save_video_metadata (without db).
+    """
+    if not rows:
+        return 0
+    
+    ensure_db()
+    values = []
     try:
-        video = db.query(VideoMetadata).filter(VideoMetadata.id == video_id).first()
-        if video:
-            db.delete(video)
-            db.commit()
-            return True
-        return False
-    finally:
-        db.close()
+        for row in rows:
+            video_bytes = row["video_bytes"]
+            values.append({
+                "prompt": row.get("prompt"),
+                "dsl_script": row["dsl_script"],
+                "model_used": row.get("model", "auto"),
+                "duration": row.get("duration", 3.0),
+                "fps": row.get("fps", 24),
+                "width": row.get("width", 640),
+                "height": row.get("height", 360),
+                "video_path": write_video_file(video_bytes),
+                "etag": compute_etag(video_bytes),
+            })
+        with engine.begin() as conn:
+            conn.execute(VideoMetadata.__table__.insert(), values)
+    except Exception:
+        for value in values:
+            remove_video_file(value["video_path"])
+        raise
+    return len(values)
+
+
+def get_all_videos(db: Session):
+    return db.query(VideoMetadata).order_by(VideoMetadata.created_at.desc()).all()
+
+
+def get_all_videos_metadata_only(db: Session):
+    return (
+        db.query(VideoMetadata)
+        .options(defer(VideoMetadata.video_bytes))
+        .order_by(VideoMetadata.created_at.desc())
+        .all()
+    )
+
+
+def get_video_by_id(db: Session, video_id: int):
+    return (
+        db.query(VideoMetadata)
+        .options(defer(VideoMetadata.video_bytes))
+        .filter(VideoMetadata.id == video_id)
+        .first()
+    )
+
+
+def get_video_bytes(db: Session, video_id: int):
+    return db.query(VideoMetadata.video_bytes).filter(VideoMetadata.id == video_id).scalar()
+
+
+def delete_video(db: Session, video_id: int):
+    video = db.query(VideoMetadata).filter(VideoMetadata.id == video_id).first()
+    if video:
+        video_path = video.video_path
+        db.delete(video)
+        db.commit()
+        remove_video_file(video_path)
+        return True
+    return False
@@ -1,5 +1,6 @@
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import List, Optional, Tuple, Dict, Any
 from .constants import (
     ALLOWED_COMMANDS, ALLOWED_SHAPE_TYPES, ALLOWED_EASE_TYPES,
@@ -8,6 +9,10 @@ from .constants import (
 )
 
 
+_TOKEN_RE = re.compile(r'"([^"]*)"?|([^\s"]+)')
+_COLOR_RE = re.compile(VALID_COLORS_PATTERN)
+
+
 class DSLParseError(Exception):
     pass
 
@@ -66,24 +71,72 @@ class AnimationSpec:
     moves: List[MoveCommand] = field(default_factory=list)
 
 
+@lru_cache(maxsize=512)
 def validate_color(color: str) -> bool:
     if not color or not isinstance(color, str):
         return False
-    return bool(re.match(VALID_COLORS_PATTERN, color))
+    return _COLOR_RE.match(color) is not None
 
 
+@lru_cache(maxsize=256)
 def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
-    hex_color = hex_color.lstrip('#')
-    r = int(hex_color[0:2], 16)
-    g = int(hex_color[2:4], 16)
-    b = int(hex_color[4:6], 16)
-    return (r, g, b)
+    value = int(hex_color.lstrip('#'), 16)
+    return (value >> 16 & 0xFF, value >> 8 & 0xFF, value & 0xFF)
+
+
+def _parse_background(tokens: List[str], spec: AnimationSpec, line_num: int):
+    color = tokens[1] if len(tokens) > 1 else "#202020"
+    if not validate_color(color):
+        raise DSLValidationError(f"Line {line_num}: Invalid color '{color}'. Use hex format like #FF0000 (red), #00FF00 (green), #0000FF (blue)")
+    spec.background = color
+
+
+def _parse_fps(tokens: List[str], spec: AnimationSpec, line_num: int):
+    fps = int(tokens[1]) if len(tokens) > 1 else 24
+    if fps < 1 or fps > MAX_FPS:
+        raise DSLValidationError(f"Line {line_num}: FPS must be between 1 and {MAX_FPS}")
+    spec.fps = fps
+
+
+def _parse_duration(tokens: List[str], spec: AnimationSpec, line_num: int):
+    duration = float(tokens[1]) if len(tokens) > 1 else 3.0
+    if duration <= 0 or duration > MAX_DURATION:
+        raise DSLValidationError(f"Line {line_num}: Duration must be between 0 and {MAX_DURATION} seconds")
+    spec.duration = duration
+
+
+def _check_object_limit(spec: AnimationSpec, line_num: int):
+    if len(spec.objects) >= MAX_OBJECTS:
+        raise DSLValidationError(f"Line {line_num}: Too many objects. Maximum is {MAX_OBJECTS}")
+
+
+def _parse_text(tokens: List[str], spec: AnimationSpec, line_num: int):
+    _check_object_limit(spec, line_num)
+    spec.objects.append(parse_text_command(tokens[1:], line_num))
+
+
+def _parse_shape(tokens: List[str], spec: AnimationSpec, line_num: int):
+    _check_object_limit(spec, line_num)
+    spec.objects.append(parse_shape_command(tokens[1:], line_num))
+
+
+def _parse_move(tokens: List[str], spec: AnimationSpec, line_num: int):
+    spec.moves.append(parse_move_command(tokens[1:], line_num))
+
+
+_COMMAND_HANDLERS = {
+    'BACKGROUND': _parse_background,
+    'FPS': _parse_fps,
+    'DURATION': _parse_duration,
+    'TEXT': _parse_text,
+    'SHAPE': _parse_shape,
+    'MOVE': _parse_move,
+}
 
 
 def parse_dsl(dsl_script: str) -> AnimationSpec:
     spec = AnimationSpec()
     lines = dsl_script.strip().split('\n')
-    object_count = 0
     
     for line_num, line in enumerate(lines, 1):
         line = line.strip()
@@ -97,45 +150,10 @@ def parse_dsl(dsl_script: str) -> AnimationSpec:
         command = tokens[0].upper()
         
         if command not in ALLOWED_COMMANDS:
-            raise DSLParseError(f"Line {line_num}: Unknown command '{command}'. Allowed: {ALLOWED_COMMANDS}")
+            raise DSLParseError(f"Line {line_num}: Unknown command '{command}'. Allowed: {', '.join(sorted(ALLOWED_COMMANDS))}")
         
         try:
-            if command == 'BACKGROUND':
-                color = tokens[1] if len(tokens) > 1 else "#202020"
-                if not validate_color(color):
-                    raise DSLValidationError(f"Line {line_num}: Invalid color '{color}'. Use hex format like #FF0000 (red), #00FF00 (green), #0000FF (blue)")
-                spec.background = color
-            
-            elif command == 'FPS':
-                fps = int(tokens[1]) if len(tokens) > 1 else 24
-                if fps < 1 or fps > MAX_FPS:
-                    raise DSLValidationError(f"Line {line_num}: FPS must be between 1 and {MAX_FPS}")
-                spec.fps = fps
-            
-            elif command == 'DURATION':
-                duration = float(tokens[1]) if len(tokens) > 1 else 3.0
-                if duration <= 0 or duration > MAX_DURATION:
-                    raise DSLValidationError(f"Line {line_num}: Duration must be between 0 and {MAX_DURATION} seconds")
-                spec.duration = duration
-            
-            elif command == 'TEXT':
-                object_count += 1
-                if object_count > MAX_OBJECTS:
-                    raise DSLValidationError(f"Line {line_num}: Too many objects. Maximum is {MAX_OBJECTS}")
-                text_cmd = parse_text_command(tokens[1:], line_num)
-                spec.objects.append(text_cmd)
-            
-            elif command == 'SHAPE':
-                object_count += 1
-                if object_count > MAX_OBJECTS:
-                    raise DSLValidationError(f"Line {line_num}: Too many objects. Maximum is {MAX_OBJECTS}")
-                shape_cmd = parse_shape_command(tokens[1:], line_num)
-                spec.objects.append(shape_cmd)
-            
-            elif command == 'MOVE':
-                move_cmd = parse_move_command(tokens[1:], line_num)
-                spec.moves.append(move_cmd)
-        
+            _COMMAND_HANDLERS[command](tokens, spec, line_num)
         except (IndexError, ValueError) as e:
             raise DSLParseError(f"Line {line_num}: Invalid syntax - {str(e)}")
     
@@ -147,71 +165,132 @@ def parse_dsl(dsl_script: str) -> AnimationSpec:
 
 
 def tokenize_line(line: str) -> List[str]:
-    tokens = []
-    current = ""
-    in_quotes = False
-    
-    for char in line:
-        if char == '"' and not in_quotes:
-            in_quotes = True
-        elif char == '"' and in_quotes:
-            in_quotes = False
-            tokens.append(current)
-            current = ""
-        elif char == ' ' and not in_quotes:
-            if current:
-                tokens.append(current)
-                current = ""
-        else:
-            current += char
-    
-    if current:
-        tokens.append(current)
-    
-    return tokens
+    return [
+        m.group(1) if m.group(1) is not None else m.group(2)
+        for m in _TOKEN_RE.finditer(line)
+    ]
+
+
+def _parse_coords(value: str) -> Optional[Tuple[int, int]]:
+    coords = value.split(',')
+    if len(coords) != 2:
+        return None
+    return (clamp_coord(int(coords[0]), MAX_WIDTH), clamp_coord(int(coords[1]), MAX_HEIGHT))
+
+
+def _set_position(cmd: Any, value: str, line_num: int):
+    coords = _parse_coords(value)
+    if coords:
+        cmd.x, cmd.y = coords
+
+
+def _set_color(cmd: Any, value: str, line_num: int):
+    if not validate_color(value):
+        raise DSLValidationError(f"Line {line_num}: Invalid color '{value}'. Use hex format like #FF0000, #00FF00, #0000FF")
+    cmd.color = value
+
+
+def _set_obj_id(cmd: Any, value: str, line_num: int):
+    cmd.obj_id = value
+
+
+def _set_move_to(cmd: Any, value: str, line_num: int):
+    coords = _parse_coords(value)
+    if coords:
+        cmd.move_to = coords
+
+
+def _set_move_duration(cmd: Any, value: str, line_num: int):
+    cmd.move_duration = max(0.0, min(float(value), MAX_DURATION))
+
+
+def _set_text_size(cmd: TextCommand, value: str, line_num: int):
+    cmd.size = min(max(int(value), 8), 200)
+
+
+def _set_radius(cmd: ShapeCommand, value: str, line_num: int):
+    cmd.radius = min(max(int(value), 1), 500)
+
+
+def _set_width(cmd: ShapeCommand, value: str, line_num: int):
+    cmd.width = min(max(int(value), 1), MAX_WIDTH)
+
+
+def _set_height(cmd: ShapeCommand, value: str, line_num: int):
+    cmd.height = min(max(int(value), 1), MAX_HEIGHT)
+
+
+def _set_shape_ease(cmd: ShapeCommand, value: str, line_num: int):
+    ease = value.lower()
+    if ease in ALLOWED_EASE_TYPES:
+        cmd.ease = ease
+
+
+def _set_move_target(cmd: MoveCommand, value: str, line_num: int):
+    coords = _parse_coords(value)
+    if coords:
+        cmd.to_x, cmd.to_y = coords
+
+
+def _set_duration(cmd: MoveCommand, value: str, line_num: int):
+    cmd.duration = max(0.1, min(float(value), MAX_DURATION))
+
+
+def _set_move_ease(cmd: MoveCommand, value: str, line_num: int):
+    ease = value.lower()
+    cmd.ease = ease if ease in ALLOWED_EASE_TYPES else "linear"
+
+
+# keyword -> (tokens consumed after the keyword, required literal after the keyword, setter)
+# The setter receives the last consumed token.
+_TEXT_KEYWORDS = {
+    'AT': (1, None, _set_position),
+    'SIZE': (1, None, _set_text_size),
+    'COLOR': (1, None, _set_color),
+    'ID': (1, None, _set_obj_id),
+    'MOVE': (2, 'TO', _set_move_to),
+    'DUR': (1, None, _set_move_duration),
+}
+
+_SHAPE_KEYWORDS = {
+    'ID': (1, None, _set_obj_id),
+    'AT': (1, None, _set_position),
+    'RADIUS': (1, None, _set_radius),
+    'WIDTH': (1, None, _set_width),
+    'HEIGHT': (1, None, _set_height),
+    'COLOR': (1, None, _set_color),
+    'MOVE': (2, 'TO', _set_move_to),
+    'DUR': (1, None, _set_move_duration),
+    'EASE': (1, None, _set_shape_ease),
+}
+
+_MOVE_KEYWORDS = {
+    'TO': (1, None, _set_move_target),
+    'DUR': (1, None, _set_duration),
+    'EASE': (1, None, _set_move_ease),
+}
+
+
+def _apply_keywords(cmd: Any, tokens: List[str], keywords: Dict[str, tuple], line_num: int):
+    i = 1
+    n = len(tokens)
+    while i < n:
+        entry = keywords.get(tokens[i].upper())
+        if entry is not None:
+            arity, literal, setter = entry
+            if i + arity < n and (literal is None or tokens[i + 1].upper() == literal):
+                setter(cmd, tokens[i + arity], line_num)
+                i += arity + 1
+                continue
+        i += 1
 
 
 def parse_text_command(tokens: List[str], line_num: int) -> TextCommand:
     if not tokens:
         raise DSLParseError(f"Line {line_num}: TEXT requires text content")
     
-    text = tokens[0]
-    cmd = TextCommand(text=text, x=100, y=100, obj_id=f"text_{line_num}")
-    
-    i = 1
-    while i < len(tokens):
-        keyword = tokens[i].upper()
-        
-        if keyword == 'AT' and i + 1 < len(tokens):
-            coords = tokens[i + 1].split(',')
-            if len(coords) == 2:
-                cmd.x = clamp_coord(int(coords[0]), MAX_WIDTH)
-                cmd.y = clamp_coord(int(coords[1]), MAX_HEIGHT)
-            i += 2
-        elif keyword == 'SIZE' and i + 1 < len(tokens):
-            cmd.size = min(max(int(tokens[i + 1]), 8), 200)
-            i += 2
-        elif keyword == 'COLOR' and i + 1 < len(tokens):
-            color = tokens[i + 1]
-            if not validate_color(color):
-                raise DSLValidationError(f"Line {line_num}: Invalid color '{color}'. Use hex format like #FF0000, #00FF00, #0000FF")
-            cmd.color = color
-            i += 2
-        elif keyword == 'ID' and i + 1 < len(tokens):
-            cmd.obj_id = tokens[i + 1]
-            i += 2
-        elif keyword == 'MOVE' and i + 2 < len(tokens) and tokens[i + 1].upper() == 'TO':
-            coords = tokens[i + 2].split(',')
-            if len(coords) == 2:
-                cmd.move_to = (clamp_coord(int(coords[0]), MAX_WIDTH), clamp_coord(int(coords[1]), MAX_HEIGHT))
-            i += 3
-        elif keyword == 'DUR' and i + 1 < len(tokens):
-            dur_val = float(tokens[i + 1])
-            cmd.move_duration = max(0.0, min(dur_val, MAX_DURATION))
-            i += 2
-        else:
-            i += 1
-    
+    cmd = TextCommand(text=tokens[0], x=100, y=100, obj_id=f"text_{line_num}")
+    _apply_keywords(cmd, tokens, _TEXT_KEYWORDS, line_num)
     return cmd
 
 
@@ -221,55 +300,10 @@ def parse_shape_command(tokens: List[str], line_num: int) -> ShapeCommand:
     
     shape_type = tokens[0].upper()
     if shape_type not in ALLOWED_SHAPE_TYPES:
-        raise DSLValidationError(f"Line {line_num}: Unknown shape type '{shape_type}'. Allowed: {ALLOWED_SHAPE_TYPES}")
+        raise DSLValidationError(f"Line {line_num}: Unknown shape type '{shape_type}'. Allowed: {', '.join(sorted(ALLOWED_SHAPE_TYPES))}")
     
     cmd = ShapeCommand(shape_type=shape_type, obj_id=f"shape_{line_num}", x=50, y=50)
-    
-    i = 1
-    while i < len(tokens):
-        keyword = tokens[i].upper()
-        
-        if keyword == 'ID' and i + 1 < len(tokens):
-            cmd.obj_id = tokens[i + 1]
-            i += 2
-        elif keyword == 'AT' and i + 1 < len(tokens):
-            coords = tokens[i + 1].split(',')
-            if len(coords) == 2:
-                cmd.x = clamp_coord(int(coords[0]), MAX_WIDTH)
-                cmd.y = clamp_coord(int(coords[1]), MAX_HEIGHT)
-            i += 2
-        elif keyword == 'RADIUS' and i + 1 < len(tokens):
-            cmd.radius = min(max(int(tokens[i + 1]), 1), 500)
-            i += 2
-        elif keyword == 'WIDTH' and i + 1 < len(tokens):
-            cmd.width = min(max(int(tokens[i + 1]), 1), MAX_WIDTH)
-            i += 2
-        elif keyword == 'HEIGHT' and i + 1 < len(tokens):
-            cmd.height = min(max(int(tokens[i + 1]), 1), MAX_HEIGHT)
-            i += 2
-        elif keyword == 'COLOR' and i + 1 < len(tokens):
-            color = tokens[i + 1]
-            if not validate_color(color):
-                raise DSLValidationError(f"Line {line_num}: Invalid color '{color}'. Use hex format like #FF0000, #00FF00, #0000FF")
-            cmd.color = color
-            i += 2
-        elif keyword == 'MOVE' and i + 2 < len(tokens) and tokens[i + 1].upper() == 'TO':
-            coords = tokens[i + 2].split(',')
-            if len(coords) == 2:
-                cmd.move_to = (clamp_coord(int(coords[0]), MAX_WIDTH), clamp_coord(int(coords[1]), MAX_HEIGHT))
-            i += 3
-        elif keyword == 'DUR' and i + 1 < len(tokens):
-            dur_val = float(tokens[i + 1])
-            cmd.move_duration = max(0.0, min(dur_val, MAX_DURATION))
-            i += 2
-        elif keyword == 'EASE' and i + 1 < len(tokens):
-            ease = tokens[i + 1].lower()
-            if ease in ALLOWED_EASE_TYPES:
-                cmd.ease = ease
-            i += 2
-        else:
-            i += 1
-    
+    _apply_keywords(cmd, tokens, _SHAPE_KEYWORDS, line_num)
     return cmd
 
 
@@ -277,34 +311,9 @@ def parse_move_command(tokens: List[str], line_num: int) -> MoveCommand:
     if len(tokens) < 4:
         raise DSLParseError(f"Line {line_num}: MOVE requires: obj_id TO x,y DUR seconds")
     
-    obj_id = tokens[0]
-    to_x, to_y = 0, 0
-    duration = 1.0
-    ease = "linear"
-    
-    i = 1
-    while i < len(tokens):
-        keyword = tokens[i].upper()
-        
-        if keyword == 'TO' and i + 1 < len(tokens):
-            coords = tokens[i + 1].split(',')
-            if len(coords) == 2:
-                to_x = clamp_coord(int(coords[0]), MAX_WIDTH)
-                to_y = clamp_coord(int(coords[1]), MAX_HEIGHT)
-            i += 2
-        elif keyword == 'DUR' and i + 1 < len(tokens):
-            dur_val = float(tokens[i + 1])
-            duration = max(0.1, min(dur_val, MAX_DURATION))
-            i += 2
-        elif keyword == 'EASE' and i + 1 < len(tokens):
-            ease = tokens[i + 1].lower()
-            if ease not in ALLOWED_EASE_TYPES:
-                ease = "linear"
-            i += 2
-        else:
-            i += 1
-    
-    return MoveCommand(obj_id=obj_id, to_x=to_x, to_y=to_y, duration=duration, ease=ease)
+    cmd = MoveCommand(obj_id=tokens[0], to_x=0, to_y=0, duration=1.0)
+    _apply_keywords(cmd, tokens, _MOVE_KEYWORDS, line_num)
+    return cmd
 
 
 def clamp_coord(val: int, max_val: int) -> int:
@@ -1,10 +1,51 @@
+import asyncio
 import os
 import re
-from typing import Optional
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import List, Optional
+
+from .dsl_parser import parse_dsl
 
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 GROQ_API_KEY = os.environ.get("GROQ_API_KEY")
 
+AVAILABLE_MODELS = {"fallback": True}
+if GROQ_API_KEY:
+    AVAILABLE_MODELS["groq"] = True
+if OPENAI_API_KEY:
+    AVAILABLE_MODELS["openai"] = True
+
+_QUOTED_DOUBLE = re.compile(r'"([^"]+)"')
+_QUOTED_SINGLE = re.compile(r"'([^']+)'")
+
+_COLOR_MAP = {
+    'red': '#FF4444',
+    'blue': '#4444FF',
+    'green': '#44FF44',
+    'yellow': '#FFFF44',
+    'orange': '#FF8844',
+    'purple': '#AA44FF',
+    'pink': '#FF44AA',
+    'white': '#FFFFFF',
+    'cyan': '#44FFFF',
+    'neon': '#00FF88',
+}
+# Only a leading word boundary, like the old substring scan, so "reddish"
+# and "greenish" still pick up their color.
+_COLOR_RE = re.compile(r'\b(' + '|'.join(_COLOR_MAP) + r')', re.IGNORECASE)
+
+_FALLBACK_BUCKETS = {
+    **dict.fromkeys(['text', 'word', 'title', 'caption', 'hello', 'message'], 'text'),
+    **dict.fromkeys(['ball', 'circle', 'bounce', 'dot', 'sphere'], 'circle'),
+    **dict.fromkeys(['square', 'rect', 'box', 'rectangle'], 'rect'),
+    **dict.fromkeys(['slide', 'move', 'animate'], 'slide'),
+}
+# Only a leading word boundary, so plurals and inflections ("balls",
+# "moving") still land in their bucket.
+_FALLBACK_RE = re.compile(r'\b(' + '|'.join(_FALLBACK_BUCKETS) + r')', re.IGNORECASE)
+
 DSL_SYSTEM_PROMPT = """You are a video animation DSL generator. Convert user prompts into a Mini-DSL animation script.
 
 RULES:
@@ -37,6 +78,57 @@ DURATION 2
 TEXT "Hello World" AT 200,160 SIZE 48 COLOR #FFFFFF MOVE TO 300,160 DUR 2
 """
 
+# Sent unchanged on every request, so providers that cache identical
+# prompt prefixes can reuse it.
+_SYS_MSG = {"role": "system", "content": DSL_SYSTEM_PROMPT}
+
+_USER_TEMPLATE = """Create a DSL animation script for: {prompt}
+
+Settings: duration={duration} seconds, fps={fps}
+
+Output only the DSL script, nothing else."""
+
+
+GROQ_MODEL = "meta-llama/llama-4-maverick-17b-128e-instruct"
+OPENAI_MODEL = "gpt-4o"
+
+# With both keys set, "auto" asks Groq first and sends the same prompt to
+# OpenAI if no answer has arrived after this many seconds.
+HEDGE_DELAY = 0.8
+
+# Per-attempt request timeout for the provider clients. The SDK defaults
+# are minutes long, which would keep a stuck request holding a thread.
+LLM_TIMEOUT = 15.0
+
+# What "auto" means is fixed by the keys present at startup
+if GROQ_API_KEY and OPENAI_API_KEY:
+    _DEFAULT_MODEL = "hedged"
+elif GROQ_API_KEY:
+    _DEFAULT_MODEL = "groq"
+elif OPENAI_API_KEY:
+    _DEFAULT_MODEL = "openai"
+else:
+    _DEFAULT_MODEL = "fallback"
+
+# Sync clients are created on first use and shared, so their HTTP
+# connection pools stay warm across requests.
+_groq = None
+_openai = None
+_client_lock = threading.Lock()
+
+# The two legs of a hedged translation run in separate pools, so a backlog
+# of slow Groq requests cannot delay the OpenAI request meant to beat them.
+_PRIMARY_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm-primary")
+_HEDGE_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm-hedge")
+
+
+def _resolve_model(model: str) -> str:
+    return _DEFAULT_MODEL if model == "auto" else model
+
+
+def _build_user_message(prompt: str, duration: float, fps: int) -> str:
+    return _USER_TEMPLATE.format(prompt=prompt, duration=min(duration, 6.0), fps=min(fps, 24))
+
 
 def translate_prompt_to_dsl(
     prompt: str, 
@@ -44,15 +136,11 @@ def translate_prompt_to_dsl(
     fps: int = 24,
     model: str = "auto"
 ) -> str:
-    if model == "auto":
-        if GROQ_API_KEY:
-            model = "groq"
-        elif OPENAI_API_KEY:
-            model = "openai"
-        else:
-            model = "fallback"
+    model = _resolve_model(model)
     
-    if model == "groq" and GROQ_API_KEY:
+    if model == "hedged":
+        return _translate_with("hedged", prompt, duration, fps)
+    elif model == "groq" and GROQ_API_KEY:
         return translate_with_groq(prompt, duration, fps)
     elif model == "openai" and OPENAI_API_KEY:
         return translate_with_openai(prompt, duration, fps)
@@ -60,70 +148,197 @@ def translate_prompt_to_dsl(
         return generate_fallback_dsl(prompt, duration, fps)
 
 
-def translate_with_groq(prompt: str, duration: float, fps: int) -> str:
-    try:
-        from groq import Groq
-        
-        client = Groq(api_key=GROQ_API_KEY)
-        
-        user_message = f"""Create a DSL animation script for: {prompt}
+def _groq_client():
+    global _groq
+    with _client_lock:
+        if _groq is None:
+            from groq import Groq
+            _groq = Groq(api_key=GROQ_API_KEY, timeout=LLM_TIMEOUT)
+        return _groq
 
-Settings: duration={min(duration, 6.0)} seconds, fps={min(fps, 24)}
 
-Output only the DSL script, nothing else."""
+def _openai_client():
+    global _openai
+    with _client_lock:
+        if _openai is None:
+            from openai import OpenAI
+            _openai = OpenAI(api_key=OPENAI_API_KEY, timeout=LLM_TIMEOUT)
+        return _openai
 
-        response = client.chat.completions.create(
-            model="meta-llama/llama-4-maverick-17b-128e-instruct",
-            messages=[
-                {"role": "system", "content": DSL_SYSTEM_PROMPT},
-                {"role": "user", "content": user_message}
-            ],
-            max_tokens=1024,
-        )
-        
-        content = response.choices[0].message.content
-        if content is None:
-            return generate_fallback_dsl(prompt, duration, fps)
-        
-        dsl_output = clean_dsl_output(content)
-        return dsl_output
+
+def _groq_completion(prompt: str, duration: float, fps: int) -> Optional[str]:
+    client = _groq_client()
+    
+    user_message = _build_user_message(prompt, duration, fps)
+
+    response = client.chat.completions.create(
+        model=GROQ_MODEL,
+        messages=[_SYS_MSG, {"role": "user", "content": user_message}],
+        max_tokens=1024,
+    )
+    return response.choices[0].message.content
+
+
+def _openai_completion(prompt: str, duration: float, fps: int) -> Optional[str]:
+    client = _openai_client()
+    
+    user_message = _build_user_message(prompt, duration, fps)
+
+    response = client.chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=[_SYS_MSG, {"role": "user", "content": user_message}],
+        max_tokens=1024,
+    )
+    return response.choices[0].message.content
+
+
+def _async_client(model: str):
+    """Return (client, model name, log label) for a fresh async client, for translate_batch"""
+    if model == "groq":
+        from groq import AsyncGroq
+        return AsyncGroq(api_key=GROQ_API_KEY, timeout=LLM_TIMEOUT), GROQ_MODEL, "Groq/Llama"
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=OPENAI_API_KEY, timeout=LLM_TIMEOUT), OPENAI_MODEL, "OpenAI"
+
+
+async def _async_completion(client, model_name: str, prompt: str, duration: float, fps: int) -> Optional[str]:
+    response = await client.chat.completions.create(
+        model=model_name,
+        messages=[_SYS_MSG, {"role": "user", "content": _build_user_message(prompt, duration, fps)}],
+        max_tokens=1024,
+    )
+    return response.choices[0].message.content
+
+
+def _hedged_completion(prompt: str, duration: float, fps: int, hedge_delay: float = HEDGE_DELAY) -> str:
+    """Ask Groq, and OpenAI too if Groq has no usable answer within hedge_delay.
+
+    Both requests go through the shared sync clients; the OpenAI one is only
+    created once the hedge fires. The first completion that parses as valid
+    DSL wins, and a request still running is left to finish in the
+    background with its result ignored. Raises if neither provider produces
+    valid DSL.
+    """
+    def attempt(completion, label: str) -> str:
+        content = completion(prompt, duration, fps)
+        try:
+            return _valid_dsl(content)
+        except Exception as e:
+            raise ValueError(f"{label}: {e}")
     
+    pending = {_PRIMARY_POOL.submit(attempt, _groq_completion, "Groq/Llama")}
+    hedged = False
+    errors = []
+    while pending:
+        done, pending = wait(
+            pending,
+            timeout=None if hedged else hedge_delay,
+            return_when=FIRST_COMPLETED,
+        )
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            errors.append(str(future.exception()))
+        if not hedged:
+            pending.add(_HEDGE_POOL.submit(attempt, _openai_completion, "OpenAI"))
+            hedged = True
+    raise RuntimeError("; ".join(errors))
+
+
+def _valid_dsl(content: Optional[str]) -> str:
+    """Clean up a completion and raise unless it parses as DSL"""
+    if content is None:
+        raise ValueError("empty completion")
+    dsl_output = clean_dsl_output(content)
+    parse_dsl(dsl_output)
+    return dsl_output
+
+
+_COMPLETIONS = {
+    "groq": (_groq_completion, "Groq/Llama"),
+    "openai": (_openai_completion, "OpenAI"),
+    "hedged": (_hedged_completion, "Groq/OpenAI"),
+}
+
+
+@lru_cache(maxsize=2048)
+def _cached_translation(prompt: str, duration: float, fps: int, model: str) -> str:
+    # Raises rather than falling back, so failed requests and invalid DSL
+    # are never cached
+    completion, _ = _COMPLETIONS[model]
+    return _valid_dsl(completion(prompt, duration, fps))
+
+
+def _translate_with(model: str, prompt: str, duration: float, fps: int) -> str:
+    try:
+        return _cached_translation(prompt.strip(), round(duration, 2), fps, model)
     except Exception as e:
-        print(f"Groq/Llama error: {e}, using fallback")
+        print(f"{_COMPLETIONS[model][1]} error: {e}, using fallback")
         return generate_fallback_dsl(prompt, duration, fps)
 
 
+def translate_with_groq(prompt: str, duration: float, fps: int) -> str:
+    return _translate_with("groq", prompt, duration, fps)
+
+
 def translate_with_openai(prompt: str, duration: float, fps: int) -> str:
-    try:
-        from openai import OpenAI
-        
-        client = OpenAI(api_key=OPENAI_API_KEY)
-        
-        user_message = f"""Create a DSL animation script for: {prompt}
+    return _translate_with("openai", prompt, duration, fps)
 
-Settings: duration={min(duration, 6.0)} seconds, fps={min(fps, 24)}
 
-Output only the DSL script, nothing else."""
+async def translate_prompt_to_dsl_async(
+    prompt: str,
+    duration: float = 3.0,
+    fps: int = 24,
+    model: str = "auto"
+) -> str:
+    """Async counterpart of translate_prompt_to_dsl for callers already on an event loop"""
+    return await asyncio.to_thread(translate_prompt_to_dsl, prompt, duration, fps, model)
 
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": DSL_SYSTEM_PROMPT},
-                {"role": "user", "content": user_message}
-            ],
-            max_tokens=1024,
-        )
+
+async def translate_batch(
+    prompts: List[str],
+    duration: float = 3.0,
+    fps: int = 24,
+    model: str = "auto",
+    max_concurrency: int = 8
+) -> List[str]:
+    """Translate many prompts concurrently over one async client.
+
+    Results keep the order of prompts; any prompt whose request fails gets
+    the fallback script, like translate_prompt_to_dsl.
+    """
+    model = _resolve_model(model)
+    if model == "hedged":
+        # Hedging doubles the request count, which a burst of prompts
+        # cannot afford; batches go to the primary provider only.
+        model = "groq"
+    if not ((model == "groq" and GROQ_API_KEY) or (model == "openai" and OPENAI_API_KEY)):
+        return [generate_fallback_dsl(prompt, duration, fps) for prompt in prompts]
+    
+    try:
+        client, model_name, label = _async_client(model)
+    except Exception as e:
+        print(f"Async {model} client error: {e}, using fallback")
+        return [generate_fallback_dsl(prompt, duration, fps) for prompt in prompts]
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def translate_one(prompt: str) -> str:
+        async with semaphore:
+            try:
+                content = await _async_completion(client, model_name, prompt, duration, fps)
+            except Exception as e:
+                print(f"{label} error: {e}, using fallback")
+                return generate_fallback_dsl(prompt, duration, fps)
         
-        content = response.choices[0].message.content
         if content is None:
             return generate_fallback_dsl(prompt, duration, fps)
-        
-        dsl_output = clean_dsl_output(content)
-        return dsl_output
+        return clean_dsl_output(content)
     
-    except Exception as e:
-        print(f"OpenAI error: {e}, using fallback")
-        return generate_fallback_dsl(prompt, duration, fps)
+    try:
+        return list(await asyncio.gather(*(translate_one(prompt) for prompt in prompts)))
+    finally:
+        await client.close()
 
 
 def clean_dsl_output(content: str) -> str:
@@ -140,11 +355,11 @@ def clean_dsl_output(content: str) -> str:
 
 
 def generate_fallback_dsl(prompt: str, duration: float = 3.0, fps: int = 24) -> str:
-    prompt_lower = prompt.lower()
     duration = min(duration, 6.0)
     fps = min(fps, 24)
+    buckets = {_FALLBACK_BUCKETS[m.group(1).lower()] for m in _FALLBACK_RE.finditer(prompt)}
     
-    if any(word in prompt_lower for word in ['text', 'word', 'title', 'caption', 'hello', 'message']):
+    if 'text' in buckets:
         text = extract_quoted_text(prompt) or "Hello World"
         return f"""BACKGROUND #202030
 FPS {fps}
@@ -152,7 +367,7 @@ DURATION {duration}
 TEXT "{text}" AT 180,150 SIZE 48 COLOR #FFFFFF MOVE TO 280,150 DUR {duration}
 """
     
-    elif any(word in prompt_lower for word in ['ball', 'circle', 'bounce', 'dot', 'sphere']):
+    elif 'circle' in buckets:
         color = extract_color(prompt) or "#FF4444"
         return f"""BACKGROUND #1a1a2e
 FPS {fps}
@@ -160,7 +375,7 @@ DURATION {duration}
 SHAPE CIRCLE ID ball AT 50,180 RADIUS 35 COLOR {color} MOVE TO 550,180 DUR {duration} EASE linear
 """
     
-    elif any(word in prompt_lower for word in ['square', 'rect', 'box', 'rectangle']):
+    elif 'rect' in buckets:
         color = extract_color(prompt) or "#44FF44"
         return f"""BACKGROUND #1a1a2e
 FPS {fps}
@@ -168,7 +383,7 @@ DURATION {duration}
 SHAPE RECT ID box AT 50,130 WIDTH 80 HEIGHT 80 COLOR {color} MOVE TO 510,130 DUR {duration} EASE linear
 """
     
-    elif any(word in prompt_lower for word in ['slide', 'move', 'animate']):
+    elif 'slide' in buckets:
         return f"""BACKGROUND #202040
 FPS {fps}
 DURATION {duration}
@@ -186,39 +401,14 @@ TEXT "Animation" AT 220,50 SIZE 36 COLOR #FFFFFF
 
 
 def extract_quoted_text(prompt: str) -> str:
-    match = re.search(r'"([^"]+)"', prompt)
-    if match:
-        return match.group(1)
-    match = re.search(r"'([^']+)'", prompt)
-    if match:
-        return match.group(1)
-    return ""
+    match = _QUOTED_DOUBLE.search(prompt) or _QUOTED_SINGLE.search(prompt)
+    return match.group(1) if match else ""
 
 
 def extract_color(prompt: str) -> str:
-    color_map = {
-        'red': '#FF4444',
-        'blue': '#4444FF',
-        'green': '#44FF44',
-        'yellow': '#FFFF44',
-        'orange': '#FF8844',
-        'purple': '#AA44FF',
-        'pink': '#FF44AA',
-        'white': '#FFFFFF',
-        'cyan': '#44FFFF',
-        'neon': '#00FF88',
-    }
-    prompt_lower = prompt.lower()
-    for color_name, hex_val in color_map.items():
-        if color_name in prompt_lower:
-            return hex_val
-    return ""
+    match = _COLOR_RE.search(prompt)
+    return _COLOR_MAP[match.group(1).lower()] if match else ""
 
 
 def get_available_models() -> dict:
-    models = {"fallback": True}
-    if GROQ_API_KEY:
-        models["groq"] = True
-    if OPENAI_API_KEY:
-        models["openai"] = True
-    return models
+    return AVAILABLE_MODELS
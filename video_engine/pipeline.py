@@ -1,18 +1,37 @@
-import base64
+import asyncio
+import os
 import time
-from typing import Optional, Tuple, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple, Union
 
 from .dsl_parser import parse_dsl, DSLParseError, DSLValidationError
 from .renderer import AnimationRenderer
-from .llm_translator import translate_prompt_to_dsl
+from .llm_translator import translate_prompt_to_dsl, translate_batch
 from .constants import MAX_DURATION, MAX_FPS, MAX_WIDTH, MAX_HEIGHT, RENDER_TIMEOUT
-from .database import save_video_metadata
+from .database import SessionLocal, ensure_db, save_video_metadata, save_videos_bulk
 
 
 class PipelineError(Exception):
     pass
 
 
+# Metadata is written off the request path; callers get their video as
+# soon as it is encoded, and the row shows up in the list shortly after.
+_METADATA_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="save-metadata")
+
+
+def _save_metadata(**fields):
+    ensure_db()
+    with SessionLocal() as db:
+        save_video_metadata(db, **fields)
+
+
+def _log_save_failure(future: Future):
+    error = future.exception()
+    if error is not None:
+        print(f"Warning: Failed to save metadata: {error}")
+
+
 def generate_video_sync(
     prompt: str,
     duration: float = 3.0,
@@ -21,7 +40,7 @@ def generate_video_sync(
     height: int = 360,
     model: str = "auto",
     save_metadata: bool = True
-) -> Tuple[str, str]:
+) -> Tuple[bytes, str]:
     start_time = time.time()
     
     duration = min(max(duration, 0.5), MAX_DURATION)
@@ -56,24 +75,20 @@ def generate_video_sync(
     if time.time() - start_time > RENDER_TIMEOUT:
         raise PipelineError("Timeout during rendering")
     
-    video_b64 = base64.b64encode(video_bytes).decode('utf-8')
-    
     if save_metadata:
-        try:
-            save_video_metadata(
-                dsl_script=dsl_script,
-                video_base64=video_bytes,
-                prompt=prompt,
-                model=model,
-                duration=duration,
-                fps=fps,
-                width=width,
-                height=height
-            )
-        except Exception as e:
-            print(f"Warning: Failed to save metadata: {e}")
-    
-    return (video_b64, dsl_script)
+        _METADATA_POOL.submit(
+            _save_metadata,
+            dsl_script=dsl_script,
+            video_bytes=video_bytes,
+            prompt=prompt,
+            model=model,
+            duration=duration,
+            fps=fps,
+            width=width,
+            height=height
+        ).add_done_callback(_log_save_failure)
+    
+    return (video_bytes, dsl_script)
 
 
 def generate_video_from_dsl(
@@ -81,7 +96,7 @@ def generate_video_from_dsl(
     width: int = 640,
     height: int = 360,
     save_metadata: bool = True
-) -> str:
+) -> bytes:
     width = min(max(width, 320), MAX_WIDTH)
     height = min(max(height, 180), MAX_HEIGHT)
     
@@ -98,20 +113,78 @@ def generate_video_from_dsl(
     except Exception as e:
         raise PipelineError(f"Rendering failed: {str(e)}")
     
-    video_b64 = base64.b64encode(video_bytes).decode('utf-8')
-    
     if save_metadata:
+        _METADATA_POOL.submit(
+            _save_metadata,
+            dsl_script=dsl_script,
+            video_bytes=video_bytes,
+            model="dsl",
+            duration=spec.duration,
+            fps=spec.fps,
+            width=width,
+            height=height
+        ).add_done_callback(_log_save_failure)
+    
+    return video_bytes
+
+
+def generate_videos_sync(
+    prompts: List[str],
+    duration: float = 3.0,
+    fps: int = 24,
+    width: int = 640,
+    height: int = 360,
+    model: str = "auto",
+    save_metadata: bool = True
+) -> List[Tuple[bytes, str]]:
+    """Generate one video per prompt, translating all prompts concurrently.
+
+    Returns (video_bytes, dsl_script) pairs in prompt order. Metadata for the
+    whole batch is saved in a single transaction, in the background.
+    """
+    duration = min(max(duration, 0.5), MAX_DURATION)
+    fps = min(max(fps, 1), MAX_FPS)
+    width = min(max(width, 320), MAX_WIDTH)
+    height = min(max(height, 180), MAX_HEIGHT)
+    
+    try:
+        dsl_scripts = asyncio.run(translate_batch(prompts, duration, fps, model))
+    except Exception as e:
+        raise PipelineError(f"Failed to generate animation scripts: {str(e)}")
+    
+    specs = []
+    for prompt, dsl_script in zip(prompts, dsl_scripts):
         try:
-            save_video_metadata(
-                dsl_script=dsl_script,
-                video_base64=video_bytes,
-                model="dsl",
-                duration=spec.duration,
-                fps=spec.fps,
-                width=width,
-                height=height
-            )
-        except Exception as e:
-            print(f"Warning: Failed to save metadata: {e}")
-    
-    return video_b64
+            specs.append(parse_dsl(dsl_script))
+        except DSLParseError as e:
+            raise PipelineError(f"Invalid animation script for {prompt!r}: {str(e)}")
+        except DSLValidationError as e:
+            raise PipelineError(f"Animation validation failed for {prompt!r}: {str(e)}")
+    
+    def render(spec) -> bytes:
+        return AnimationRenderer(spec, width=width, height=height).render_to_bytes()
+    
+    # Each video is encoded by its own ffmpeg process; threads let those
+    # encodes overlap with each other and with drawing the next frames.
+    try:
+        with ThreadPoolExecutor(max_workers=min(len(specs), os.cpu_count() or 1) or 1) as executor:
+            videos = list(executor.map(render, specs))
+    except Exception as e:
+        raise PipelineError(f"Rendering failed: {str(e)}")
+    
+    if save_metadata:
+        _METADATA_POOL.submit(save_videos_bulk, [
+            {
+                "dsl_script": dsl_script,
+                "video_bytes": video_bytes,
+                "prompt": prompt,
+                "model": model,
+                "duration": duration,
+                "fps": fps,
+                "width": width,
+                "height": height,
+            }
+            for prompt, dsl_script, video_bytes in zip(prompts, dsl_scripts, videos)
+        ]).add_done_callback(_log_save_failure)
+    
+    return list(zip(videos, dsl_scripts))
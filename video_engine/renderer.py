@@ -1,8 +1,12 @@
-import tempfile
-import os
-from typing import List, Tuple, Any
+import queue
+import subprocess
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Any
 from PIL import Image, ImageDraw, ImageFont
 import imageio
+import imageio_ffmpeg
 import numpy as np
 
 from .dsl_parser import (
@@ -30,12 +34,59 @@ EASE_FUNCTIONS = {
     'ease-out': ease_out,
 }
 
+# libx264 presets for short, low-resolution clips: encode speed matters far
+# more than the few extra kilobytes ultrafast costs, and zerolatency drops
+# the frame lookahead so output starts as soon as frames arrive.
+X264_OPTIONS = ['-preset', 'ultrafast', '-tune', 'zerolatency']
+
+# Rendered frames waiting for the ffmpeg feeder thread in render_to_bytes
+ENCODE_QUEUE_SIZE = 8
+
+@lru_cache(maxsize=None)
+def _load_font(size: int):
+    try:
+        return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size)
+    except:
+        try:
+            return ImageFont.truetype("DejaVuSans.ttf", size)
+        except:
+            return ImageFont.load_default()
+
+
+def _clip_box(buf: np.ndarray, x: int, y: int, w: int, h: int):
+    """Return (canvas slices, sprite slices) for a w*h sprite at x,y, or None if off-canvas"""
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w, buf.shape[1]), min(y + h, buf.shape[0])
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return (slice(y0, y1), slice(x0, x1)), (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+
+
+def _blit_mask(buf: np.ndarray, mask: np.ndarray, x: int, y: int, color: Tuple[int, int, int]):
+    box = _clip_box(buf, x, y, mask.shape[1], mask.shape[0])
+    if box is not None:
+        dst, src = box
+        buf[dst][mask[src]] = color
+
+
+def _blit_alpha(buf: np.ndarray, alpha: np.ndarray, x: int, y: int, color: Tuple[int, int, int]):
+    box = _clip_box(buf, x, y, alpha.shape[1], alpha.shape[0])
+    if box is None:
+        return
+    dst, src = box
+    region = buf[dst]
+    a = alpha[src].astype(np.uint32)[..., None]
+    # Same rounded division by 255 that PIL uses when filling through a mask
+    blended = region * (255 - a) + np.array(color, dtype=np.uint32) * a + 128
+    region[...] = (blended + (blended >> 8)) >> 8
+
 
 class AnimationRenderer:
     def __init__(self, spec: AnimationSpec, width: int = 640, height: int = 360):
         self.spec = spec
-        self.width = min(width, MAX_WIDTH)
-        self.height = min(height, MAX_HEIGHT)
+        # yuv420p needs even dimensions
+        self.width = min(width, MAX_WIDTH) // 2 * 2
+        self.height = min(height, MAX_HEIGHT) // 2 * 2
         self.frames: List[Image.Image] = []
         self.total_frames = int(spec.fps * spec.duration)
         self.bg_color = hex_to_rgb(spec.background)
@@ -43,7 +94,20 @@ class AnimationRenderer:
         self.object_positions = {}
         self.object_moves = {}
         
+        self._background = np.full((self.height, self.width, 3), self.bg_color, dtype=np.uint8)
+        self._circle_masks: Dict[int, np.ndarray] = {}
+        self._text_sprites: Dict[int, Tuple[np.ndarray, int, int]] = {}
+        self._colors: Dict[int, Tuple[int, int, int]] = {}
+        self._pos_x: Dict[str, np.ndarray] = {}
+        self._pos_y: Dict[str, np.ndarray] = {}
+        
         self._prepare_movements()
+        self._build_position_tables()
+        self._prepare_sprites()
+        self._prepare_watermark()
+        self._dynamic_objects = self._bake_static_objects()
+        self._repeats = self._find_repeated_frames()
+        self._last_frame: Optional[Tuple[int, np.ndarray]] = None
     
     def _prepare_movements(self):
         for obj in self.spec.objects:
@@ -71,53 +135,115 @@ class AnimationRenderer:
                     'ease': move.ease
                 }
     
-    def _get_position(self, obj_id: str, frame: int) -> Tuple[int, int]:
-        if obj_id not in self.object_moves:
-            return self.object_positions.get(obj_id, (0, 0))
-        
-        move = self.object_moves[obj_id]
-        start_frame = move['start_frame']
-        end_frame = move['end_frame']
-        
-        if frame < start_frame:
-            return move['from']
-        if frame >= end_frame:
-            return move['to']
-        
-        progress = (frame - start_frame) / max(1, end_frame - start_frame)
-        ease_func = EASE_FUNCTIONS.get(move['ease'], ease_linear)
-        t = ease_func(progress)
-        
-        x = int(move['from'][0] + (move['to'][0] - move['from'][0]) * t)
-        y = int(move['from'][1] + (move['to'][1] - move['from'][1]) * t)
+    def _prepare_sprites(self):
+        """Rasterize every circle size and text string, and parse every color, once"""
+        for obj in self.spec.objects:
+            if isinstance(obj, (TextCommand, ShapeCommand)):
+                self._colors[id(obj)] = hex_to_rgb(obj.color)
+            
+            if isinstance(obj, ShapeCommand) and obj.shape_type == 'CIRCLE':
+                if obj.radius not in self._circle_masks:
+                    self._circle_masks[obj.radius] = self._rasterize_circle(obj.radius)
+            elif isinstance(obj, TextCommand):
+                self._text_sprites[id(obj)] = self._rasterize_text(obj.text, self._get_font(obj.size))
+    
+    def _bake_static_objects(self) -> List[Any]:
+        """Draw the leading run of non-moving objects into the background.
+
+        Only the leading run can be baked: anything after the first moving
+        object may be drawn over it. Returns the objects left to draw per frame.
+        """
+        for i, obj in enumerate(self.spec.objects):
+            if obj.obj_id in self.object_moves:
+                return self.spec.objects[i:]
+            self._draw_object(self._background, obj, 0)
+        return []
+    
+    def _find_repeated_frames(self) -> np.ndarray:
+        """Flag frames whose drawn objects sit exactly where they were one frame earlier.
+
+        Slow moves and finished tweens quantize to the same integer position
+        over many frames; those frames are pixel-identical to the previous one.
+        """
+        repeats = np.zeros(self.total_frames, dtype=bool)
+        repeats[1:] = True
+        for obj_id in {obj.obj_id for obj in self._dynamic_objects}:
+            if obj_id in self._pos_x:
+                xs, ys = self._pos_x[obj_id], self._pos_y[obj_id]
+                repeats[1:] &= (xs[1:] == xs[:-1]) & (ys[1:] == ys[:-1])
+        return repeats
+    
+    def _rasterize_circle(self, r: int) -> np.ndarray:
+        # Drawn by PIL so the outline matches draw.ellipse pixel for pixel
+        mask = Image.new('L', (2 * r + 1, 2 * r + 1), 0)
+        ImageDraw.Draw(mask).ellipse((0, 0, 2 * r, 2 * r), fill=255)
+        return np.asarray(mask) > 0
+    
+    def _rasterize_text(self, text: str, font) -> Tuple[np.ndarray, int, int]:
+        left, top, right, bottom = font.getbbox(text)
+        sprite = Image.new('L', (max(right - left, 0), max(bottom - top, 0)), 0)
+        ImageDraw.Draw(sprite).text((-left, -top), text, fill=255, font=font)
+        return np.asarray(sprite), left, top
+    
+    def _build_position_tables(self):
+        """Tween every object once into per-frame x/y arrays indexed by frame number"""
+        frames = np.arange(self.total_frames)
         
-        return (x, y)
+        for obj_id, (x, y) in self.object_positions.items():
+            move = self.object_moves.get(obj_id)
+            if move is None:
+                self._pos_x[obj_id] = np.full(self.total_frames, x, dtype=np.int32)
+                self._pos_y[obj_id] = np.full(self.total_frames, y, dtype=np.int32)
+                continue
+            
+            start_frame = move['start_frame']
+            end_frame = move['end_frame']
+            (from_x, from_y), (to_x, to_y) = move['from'], move['to']
+            
+            progress = (frames - start_frame) / max(1, end_frame - start_frame)
+            ease_func = EASE_FUNCTIONS.get(move['ease'], ease_linear)
+            t = ease_func(progress)
+            
+            # astype truncates toward zero, like int() on a single position
+            xs = (from_x + (to_x - from_x) * t).astype(np.int32)
+            ys = (from_y + (to_y - from_y) * t).astype(np.int32)
+            xs[frames < start_frame], ys[frames < start_frame] = from_x, from_y
+            xs[frames >= end_frame], ys[frames >= end_frame] = to_x, to_y
+            self._pos_x[obj_id] = xs
+            self._pos_y[obj_id] = ys
+    
+    def _get_position(self, obj_id: str, frame: int) -> Tuple[int, int]:
+        if obj_id not in self._pos_x:
+            return (0, 0)
+        return int(self._pos_x[obj_id][frame]), int(self._pos_y[obj_id][frame])
     
     def _get_font(self, size: int):
-        try:
-            return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size)
-        except:
-            try:
-                return ImageFont.truetype("DejaVuSans.ttf", size)
-            except:
-                return ImageFont.load_default()
+        return _load_font(size)
     
-    def _draw_text(self, draw: Any, cmd: TextCommand, frame: int):
+    def _draw_text(self, buf: np.ndarray, cmd: TextCommand, frame: int):
         x, y = self._get_position(cmd.obj_id, frame)
-        color = hex_to_rgb(cmd.color)
-        font = self._get_font(cmd.size)
-        draw.text((x, y), cmd.text, fill=color, font=font)
+        color = self._colors[id(cmd)]
+        alpha, left, top = self._text_sprites[id(cmd)]
+        _blit_alpha(buf, alpha, x + left, y + top, color)
     
-    def _draw_shape(self, draw: Any, cmd: ShapeCommand, frame: int):
+    def _draw_shape(self, buf: np.ndarray, cmd: ShapeCommand, frame: int):
         x, y = self._get_position(cmd.obj_id, frame)
-        color = hex_to_rgb(cmd.color)
+        color = self._colors[id(cmd)]
         
         if cmd.shape_type == 'CIRCLE':
             r = cmd.radius
-            draw.ellipse((x - r, y - r, x + r, y + r), fill=color)
+            _blit_mask(buf, self._circle_masks[r], x - r, y - r, color)
         elif cmd.shape_type == 'RECT':
-            w, h = cmd.width, cmd.height
-            draw.rectangle((x, y, x + w, y + h), fill=color)
+            # PIL rectangles include both corners, hence the +1
+            box = _clip_box(buf, x, y, cmd.width + 1, cmd.height + 1)
+            if box is not None:
+                buf[box[0]] = color
+    
+    def _draw_object(self, buf: np.ndarray, obj: Any, frame: int):
+        if isinstance(obj, TextCommand):
+            self._draw_text(buf, obj, frame)
+        elif isinstance(obj, ShapeCommand):
+            self._draw_shape(buf, obj, frame)
     
     def _get_contrasting_color(self, rgb: Tuple[int, int, int]) -> Tuple[int, int, int, int]:
         """Calculate contrasting color based on background luminosity"""
@@ -133,42 +259,62 @@ class AnimationRenderer:
             # Dark background: use white with opacity
             return (255, 255, 255, 200)
     
-    def _draw_watermark(self, img: Image.Image):
-        """Draw AnveshAI watermark at bottom-right corner, scaled to background"""
-        draw = ImageDraw.Draw(img, 'RGBA')
+    def _prepare_watermark(self):
+        """Rasterize the AnveshAI watermark once, anchored at the bottom-right corner"""
         watermark_text = "AnveshAI"
         # Make watermark much bigger - scales with height
         font_size = max(24, int(self.height / 12))
         font = self._get_font(font_size)
         
-        # Get text bounding box for positioning
-        bbox = draw.textbbox((0, 0), watermark_text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
+        alpha, left, top = self._rasterize_text(watermark_text, font)
+        text_width, text_height = alpha.shape[1], alpha.shape[0]
         
         # Position at bottom-right with padding
         padding = 15
         x = self.width - text_width - padding
         y = self.height - text_height - padding
         
-        # Choose color based on background
-        watermark_color = self._get_contrasting_color(self.bg_color)
-        draw.text((x, y), watermark_text, fill=watermark_color, font=font)
+        # Choose color based on background. PIL's text fill never applied the
+        # alpha channel, so the watermark is blended by glyph coverage alone.
+        r, g, b, _ = self._get_contrasting_color(self.bg_color)
+        self._watermark = (alpha, x + left, y + top, (r, g, b))
+    
+    def _draw_watermark(self, buf: np.ndarray):
+        alpha, x, y, color = self._watermark
+        _blit_alpha(buf, alpha, x, y, color)
     
     def render_frame(self, frame_num: int) -> Image.Image:
-        img = Image.new('RGB', (self.width, self.height), color=self.bg_color)
-        draw = ImageDraw.Draw(img)
+        return Image.fromarray(self.render_array(frame_num))
+    
+    def render_array(self, frame_num: int) -> np.ndarray:
+        """Render one frame as a read-only RGB array.
+
+        When frames are rendered in order, a frame identical to the previous
+        one returns the previous array instead of being drawn again.
+        """
+        last = self._last_frame
+        if last is not None and last[0] == frame_num - 1 and self._repeats[frame_num]:
+            self._last_frame = (frame_num, last[1])
+            return last[1]
         
-        for obj in self.spec.objects:
-            if isinstance(obj, TextCommand):
-                self._draw_text(draw, obj, frame_num)
-            elif isinstance(obj, ShapeCommand):
-                self._draw_shape(draw, obj, frame_num)
+        buf = self._background.copy()
+        
+        for obj in self._dynamic_objects:
+            self._draw_object(buf, obj, frame_num)
         
         # Add watermark
-        self._draw_watermark(img)
+        self._draw_watermark(buf)
         
-        return img
+        buf.flags.writeable = False
+        self._last_frame = (frame_num, buf)
+        return buf
+    
+    def iter_frames(self) -> Iterator[np.ndarray]:
+        """Yield frames as RGB arrays in order without keeping them around"""
+        # Frames are drawn in-process: a numpy frame takes a few milliseconds,
+        # less than shipping it back from a worker process would.
+        for i in range(self.total_frames):
+            yield self.render_array(i)
     
     def render_all_frames(self) -> List[Image.Image]:
         self.frames = []
@@ -177,30 +323,104 @@ class AnimationRenderer:
             self.frames.append(frame)
         return self.frames
     
-    def _frames_to_arrays(self) -> List[np.ndarray]:
-        return [np.array(frame) for frame in self.frames]
+    def _frames_to_arrays(self) -> Iterator[np.ndarray]:
+        return (np.asarray(frame) for frame in self.frames)
+    
+    def _write_mp4(self, output_path: str, frames: Iterable[np.ndarray]):
+        with imageio.get_writer(output_path, fps=self.spec.fps, macro_block_size=1,
+                                output_params=X264_OPTIONS) as writer:
+            for frame in frames:
+                writer.append_data(frame)
     
     def save_mp4(self, output_path: str) -> str:
-        if not self.frames:
-            self.render_all_frames()
-        
-        frame_arrays = self._frames_to_arrays()
-        imageio.mimsave(output_path, frame_arrays, fps=self.spec.fps, macro_block_size=1)
+        frames = self._frames_to_arrays() if self.frames else self.iter_frames()
+        self._write_mp4(output_path, frames)
         return output_path
     
+    def _ffmpeg_command(self) -> List[str]:
+        # imageio's default quality (crf 25) with X264_OPTIONS, fragmented so
+        # the MP4 can be written to a pipe.
+        return [
+            imageio_ffmpeg.get_ffmpeg_exe(), '-y',
+            '-f', 'rawvideo', '-vcodec', 'rawvideo',
+            '-s', f'{self.width}x{self.height}', '-pix_fmt', 'rgb24',
+            '-r', f'{self.spec.fps:.02f}', '-i', '-',
+            '-vcodec', 'libx264', '-pix_fmt', 'yuv420p', '-crf', '25',
+            *X264_OPTIONS,
+            '-v', 'error',
+            '-f', 'mp4', '-movflags', 'frag_keyframe+empty_moov', 'pipe:1',
+        ]
+    
     def render_to_bytes(self) -> bytes:
-        if not self.frames:
-            self.render_all_frames()
+        frames = self._frames_to_arrays() if self.frames else self.iter_frames()
+        deadline = time.monotonic() + RENDER_TIMEOUT
         
-        with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as tmp:
-            tmp_path = tmp.name
+        with subprocess.Popen(
+            self._ffmpeg_command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        ) as proc:
+            # ffmpeg writes output and diagnostics while input is still
+            # arriving, so both pipes are drained concurrently or they fill up.
+            output: List[bytes] = []
+            errors: List[bytes] = []
+            readers = [
+                threading.Thread(target=lambda: output.append(proc.stdout.read()), daemon=True),
+                threading.Thread(target=lambda: errors.append(proc.stderr.read()), daemon=True),
+            ]
+            for reader in readers:
+                reader.start()
+            
+            # Frames are rendered on this thread and fed to ffmpeg from another,
+            # so drawing the next frames overlaps with ffmpeg consuming the last.
+            frame_queue: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(maxsize=ENCODE_QUEUE_SIZE)
+            
+            def feed_encoder():
+                try:
+                    while (frame := frame_queue.get()) is not None:
+                        proc.stdin.write(memoryview(np.ascontiguousarray(frame, dtype=np.uint8)))
+                except BrokenPipeError:
+                    pass  # ffmpeg exited; its status and stderr are reported below
+                finally:
+                    try:
+                        proc.stdin.close()
+                    except BrokenPipeError:
+                        pass
+            
+            encoder = threading.Thread(target=feed_encoder, daemon=True)
+            encoder.start()
+            
+            def hand_over(frame: Optional[np.ndarray]) -> bool:
+                """Queue a frame for the encoder; False once the encoder has stopped"""
+                while encoder.is_alive():
+                    try:
+                        frame_queue.put(frame, timeout=0.1)
+                        return True
+                    except queue.Full:
+                        if time.monotonic() > deadline:
+                            raise subprocess.TimeoutExpired(proc.args, RENDER_TIMEOUT)
+                return False
+            
+            try:
+                for frame in frames:
+                    if not hand_over(frame):
+                        break
+                hand_over(None)
+                encoder.join(max(0.0, deadline - time.monotonic()))
+                proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except BaseException:
+                proc.kill()
+                try:
+                    frame_queue.put_nowait(None)  # wake the encoder if it waits for frames
+                except queue.Full:
+                    pass  # it is mid-write and stops on the broken pipe
+                raise
+            finally:
+                for reader in readers:
+                    reader.join()
         
-        try:
-            frame_arrays = self._frames_to_arrays()
-            imageio.mimsave(tmp_path, frame_arrays, fps=self.spec.fps, macro_block_size=1)
-            with open(tmp_path, 'rb') as f:
-                video_bytes = f.read()
-            return video_bytes
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+        if proc.returncode != 0:
+            error = b"".join(errors).decode(errors='replace').strip()
+            raise RuntimeError(f"ffmpeg exited with code {proc.returncode}: {error}")
+        return output[0]